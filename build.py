@@ -3,11 +3,43 @@ PyInstaller打包脚本
 将Python应用程序打包为单个exe文件
 """
 
-import PyInstaller.__main__
 import os
+import shutil
+import subprocess
 import sys
 from pathlib import Path
 
+# 全局环境缺少PyInstaller时仍可通过隔离venv打包
+try:
+    import PyInstaller.__main__
+except ImportError:
+    PyInstaller = None
+
+
+def prepare_build_venv(project_root):
+    """
+    创建仅含运行时依赖的隔离venv，避免全局site-packages中的
+    无关库（numpy/pandas等）被意外打入包内
+
+    Returns:
+        venv中的pyinstaller可执行文件路径，创建失败返回None
+    """
+    venv_dir = project_root / '.build-venv'
+    bin_dir = venv_dir / ('Scripts' if os.name == 'nt' else 'bin')
+    pyi = bin_dir / ('pyinstaller.exe' if os.name == 'nt' else 'pyinstaller')
+
+    try:
+        if not pyi.exists():
+            print("创建隔离打包环境 .build-venv ...")
+            subprocess.check_call([sys.executable, '-m', 'venv', str(venv_dir)])
+            pip = bin_dir / ('pip.exe' if os.name == 'nt' else 'pip')
+            subprocess.check_call([str(pip), 'install', 'pyinstaller', 'urllib3'])
+        return pyi
+    except Exception as e:
+        print(f"警告: 创建隔离环境失败（{e}），回退到当前环境的PyInstaller")
+        return None
+
+
 def build():
     """执行打包"""
     print("=" * 50)
@@ -17,72 +49,67 @@ def build():
     # 获取项目根目录
     project_root = Path(__file__).parent.resolve()
     
-    # 检查必要文件
-    required_files = ['main.py', 'config.py', 'git_helper.py', 'deepseek_api.py']
+    # 检查必要文件（打包参数集中在dsc.spec维护）
+    required_files = ['main.py', 'config.py', 'git_helper.py', 'deepseek_api.py', 'dsc.spec']
     for file in required_files:
         if not (project_root / file).exists():
             print(f"错误: 未找到文件 {file}")
             sys.exit(1)
-    
-    # 图标路径
+
+    # 预编译源码（-OO去除assert和docstring）：
+    # 在调用PyInstaller前快速暴露语法错误，并预热本地字节码缓存；
+    # 打入包内的字节码由dsc.spec的optimize=2保证同等优化级别
+    print("预编译源码 (-OO) ...")
+    source_files = [str(project_root / f) for f in required_files if f.endswith('.py')]
+    try:
+        subprocess.check_call(
+            [sys.executable, '-OO', '-m', 'compileall', '-q', '-f'] + source_files)
+    except subprocess.CalledProcessError:
+        print("错误: 源码预编译失败，请先修复语法错误")
+        sys.exit(1)
+
+    # 图标路径（由dsc.spec读取，存在时自动使用）
     icon_path = project_root / 'icon.ico'
-    icon_arg = []
     if icon_path.exists():
-        icon_arg = [f'--icon={icon_path}']
         print(f"使用图标: {icon_path}")
     else:
         print("警告: 未找到 icon.ico，将使用默认图标")
-    
-    # PyInstaller参数
+
+    # 排除列表、二进制剔除、optimize/strip/upx等设置均在dsc.spec中
     args = [
-        'main.py',  # 主入口文件
-        '--name=dsc',  # 输出exe名称
-        '--onefile',  # 打包为单个文件
+        'dsc.spec',
         '--clean',  # 清理临时文件
         '--noconfirm',  # 覆盖输出目录
-        
-        # 隐藏导入（确保包含）
-        '--hidden-import=requests',
-        '--hidden-import=json',
-        '--hidden-import=subprocess',
-        '--hidden-import=pathlib',
-        '--hidden-import=logging',
-        '--hidden-import=queue',
-        '--hidden-import=threading',
-        '--hidden-import=winreg',  # Windows注册表访问
-        
-        # 排除不需要的模块（减小体积）
-        '--exclude-module=matplotlib',
-        '--exclude-module=numpy',
-        '--exclude-module=pandas',
-        '--exclude-module=scipy',
-        '--exclude-module=PIL',
-        
-        # 添加数据文件（如果需要）
-        # '--add-data=icon.ico;.',  # Windows格式
-        
-        # 版本信息（可选）
-        # '--version-file=version.txt',
     ]
-    
-    # 添加图标参数
-    args.extend(icon_arg)
-    
-    # UPX压缩（如果可用）
+
+    # UPX压缩（如果可用）：优先UPX_DIR环境变量，否则在PATH中自动探测
+    # （具体的upx_exclude列表在dsc.spec中维护）
     upx_dir = os.environ.get('UPX_DIR')
-    if upx_dir and Path(upx_dir).exists():
+    if not (upx_dir and Path(upx_dir).exists()):
+        upx_bin = shutil.which('upx')
+        upx_dir = str(Path(upx_bin).parent) if upx_bin else None
+    if upx_dir:
         args.append(f'--upx-dir={upx_dir}')
         print(f"使用UPX压缩: {upx_dir}")
     else:
-        print("提示: 未设置UPX_DIR环境变量，跳过UPX压缩")
+        print("提示: 未找到UPX（可设置UPX_DIR环境变量或加入PATH），跳过UPX压缩")
     
+    # 优先使用隔离venv中的PyInstaller（全局环境仅作回退）
+    pyi_exe = prepare_build_venv(project_root)
+
     print("\n开始打包...")
     print(f"PyInstaller参数: {' '.join(args)}")
     print("-" * 50)
-    
+
     try:
         # 执行打包
-        PyInstaller.__main__.run(args)
+        if pyi_exe:
+            subprocess.check_call([str(pyi_exe)] + args, cwd=str(project_root))
+        elif PyInstaller is not None:
+            PyInstaller.__main__.run(args)
+        else:
+            print("错误: 未找到PyInstaller，请先 pip install pyinstaller")
+            sys.exit(1)
         
         print("-" * 50)
         print("打包完成！")
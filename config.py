@@ -6,16 +6,69 @@
 
 import json
 import os
+import pickle
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 可选的orjson快速通道（C实现，解析/序列化快3-10倍），不可用时回退标准库json
+try:
+    import orjson
+
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# 配置校验错误信息（模块级常量，避免每次validate重建字典）
+_ERROR_MESSAGES = {
+    'zh-CN': {
+        'no_api_key': 'API Key未设置，请在配置中设置DeepSeek API Key',
+        'no_model': '模型名称不能为空',
+        'invalid_language': "语言设置无效，必须是 'zh-CN' 或 'en'",
+        'invalid_commit_style': "提交风格无效，必须是 'conventional', 'simple' 或 'emoji'",
+        'invalid_temperature': '随机性(temperature)必须在0.1-1.0之间',
+        'invalid_max_diff_length': '最大差异长度必须至少为100',
+    },
+    'en': {
+        'no_api_key': 'API Key not set, please configure DeepSeek API Key',
+        'no_model': 'Model name cannot be empty',
+        'invalid_language': "Invalid language setting, must be 'zh-CN' or 'en'",
+        'invalid_commit_style': "Invalid commit style, must be 'conventional', 'simple' or 'emoji'",
+        'invalid_temperature': 'Temperature must be between 0.1 and 1.0',
+        'invalid_max_diff_length': 'Max diff length must be at least 100',
+    }
+}
+
+# 校验表：(配置键, 判断函数, 错误信息ID)，validate按序单次遍历
+_VALIDATORS = (
+    ('api_key', lambda v: bool(v), 'no_api_key'),
+    ('model', lambda v: bool(v), 'no_model'),
+    ('language', lambda v: v in ('zh-CN', 'en'), 'invalid_language'),
+    ('commit_style', lambda v: v in ('conventional', 'simple', 'emoji'), 'invalid_commit_style'),
+    ('temperature', lambda v: isinstance(v, (int, float)) and 0.1 <= v <= 1.0, 'invalid_temperature'),
+    ('max_diff_length', lambda v: isinstance(v, int) and v >= 100, 'invalid_max_diff_length'),
+)
+
 
 class ConfigManager:
     """配置管理器，使用单例模式确保全局一致"""
-    
+
+    # 固定实例属性：省去实例__dict__，属性访问变为C层偏移查找
+    # （单例标记_instance/_initialized保持为类属性，不受slots约束）
+    __slots__ = ('user_home', 'config_dir', 'config_file', 'cache_file',
+                 'default_config', '_config', '_saved_hash', '_version')
+
     _instance = None
     _initialized = False
     
@@ -30,6 +83,7 @@ class ConfigManager:
             self.user_home = Path(os.environ.get('USERPROFILE', os.path.expanduser('~')))
             self.config_dir = self.user_home / '.deepseek-commit'
             self.config_file = self.config_dir / 'config.json'
+            self.cache_file = self.config_dir / 'config.cache.pkl'
             
             # 默认配置
             self.default_config = {
@@ -46,39 +100,115 @@ class ConfigManager:
                 'api_base_url': 'https://api.deepseek.com/v1/chat/completions'
             }
             
-            self.config = self.default_config.copy()
-            self._load()
+            # 延迟加载：首次访问config时才读取文件，
+            # 避免--help等不需要配置的路径产生文件系统开销
+            self._config: Optional[Dict[str, Any]] = None
+            self._saved_hash: Optional[int] = None
+            # 配置版本号：每次修改递增，供调用方缓存派生值（如请求头）并按需失效
+            self._version = 0
             ConfigManager._initialized = True
-    
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """配置字典（首次访问时加载并缓存）"""
+        if self._config is None:
+            self._load()
+        return self._config
+
+    @config.setter
+    def config(self, value: Dict[str, Any]) -> None:
+        self._config = value
+
     def _load(self) -> None:
-        """从文件加载配置"""
+        """从文件加载配置（优先使用pickle缓存，避免重复解析JSON）"""
+        if self._config is not None:
+            return
         try:
             if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
-                    # 合并默认配置和加载的配置，确保所有键都存在
-                    self.config = {**self.default_config, **loaded_config}
+                stat = os.stat(self.config_file)
+                file_key = (stat.st_mtime_ns, stat.st_size)
+
+                # 尝试读取缓存：config.json未变化时跳过JSON解析和字典合并
+                cached = self._load_cache(file_key)
+                if cached is not None:
+                    self.config = cached
+                    self._saved_hash = self._config_hash()
+                    logger.debug(f"配置已从缓存 {self.cache_file} 加载")
+                    return
+
+                loaded_config = _loads(self.config_file.read_bytes())
+                # 合并默认配置和加载的配置，确保所有键都存在
+                self.config = {**self.default_config, **loaded_config}
+                self._write_cache(file_key)
+                self._saved_hash = self._config_hash()
                 logger.info(f"配置已从 {self.config_file} 加载")
             else:
                 logger.info("配置文件不存在，使用默认配置")
+                self._config = self.default_config.copy()
                 self.save()  # 创建默认配置文件
-        except json.JSONDecodeError as e:
+        except ValueError as e:
+            # json.JSONDecodeError与orjson.JSONDecodeError均为ValueError子类
             logger.error(f"配置文件JSON格式错误: {e}，使用默认配置")
             self.config = self.default_config.copy()
         except Exception as e:
             logger.error(f"加载配置时出错: {e}，使用默认配置")
             self.config = self.default_config.copy()
-    
+
+    def _load_cache(self, file_key: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        """
+        读取pickle缓存中已合并的配置
+
+        Args:
+            file_key: config.json的(st_mtime_ns, st_size)
+
+        Returns:
+            缓存命中时返回合并后的配置字典，否则返回None
+        """
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'rb') as f:
+                    cached_mtime_ns, cached_size, merged_dict = pickle.load(f)
+                if (cached_mtime_ns, cached_size) == file_key and isinstance(merged_dict, dict):
+                    return merged_dict
+        except Exception as e:
+            logger.debug(f"读取配置缓存失败: {e}，回退到JSON解析")
+        return None
+
+    def _write_cache(self, file_key: Tuple[int, int]) -> None:
+        """写入pickle缓存（通过os.replace原子替换）"""
+        try:
+            tmp_file = self.cache_file.with_suffix('.pkl.tmp')
+            with open(tmp_file, 'wb') as f:
+                pickle.dump((file_key[0], file_key[1], self.config), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.debug(f"写入配置缓存失败: {e}")
+
+    def _config_hash(self) -> int:
+        """计算当前配置的指纹，用于判断是否需要落盘"""
+        return hash(repr(sorted(self.config.items())))
+
     def save(self) -> bool:
-        """保存配置到文件"""
+        """保存配置到文件（内容未变化时跳过写入）"""
         try:
+            current_hash = self._config_hash()
+            if self._saved_hash is not None and current_hash == self._saved_hash:
+                logger.debug("配置未变化，跳过保存")
+                return True
+
             # 确保配置目录存在
             self.config_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 保存配置
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
-            
+
+            # 先写临时文件再os.replace原子替换，避免写到一半损坏config.json
+            tmp_file = self.config_file.with_suffix('.json.tmp')
+            tmp_file.write_bytes(_dumps(self.config))
+            os.replace(tmp_file, self.config_file)
+            self._saved_hash = current_hash
+
+            # 同步刷新缓存，下次启动直接命中
+            stat = os.stat(self.config_file)
+            self._write_cache((stat.st_mtime_ns, stat.st_size))
+
             logger.info(f"配置已保存到 {self.config_file}")
             return True
         except Exception as e:
@@ -95,57 +225,16 @@ class ConfigManager:
         """
         # 获取语言设置
         lang = language or self.config.get('language', 'zh-CN')
-        if lang not in ['zh-CN', 'en']:
+        if lang not in ('zh-CN', 'en'):
             lang = 'zh-CN'
-        
-        # 错误信息字典
-        error_messages = {
-            'zh-CN': {
-                'no_api_key': 'API Key未设置，请在配置中设置DeepSeek API Key',
-                'no_model': '模型名称不能为空',
-                'invalid_language': "语言设置无效，必须是 'zh-CN' 或 'en'",
-                'invalid_commit_style': "提交风格无效，必须是 'conventional', 'simple' 或 'emoji'",
-                'invalid_temperature': '随机性(temperature)必须在0.1-1.0之间',
-                'invalid_max_diff_length': '最大差异长度必须至少为100',
-            },
-            'en': {
-                'no_api_key': 'API Key not set, please configure DeepSeek API Key',
-                'no_model': 'Model name cannot be empty',
-                'invalid_language': "Invalid language setting, must be 'zh-CN' or 'en'",
-                'invalid_commit_style': "Invalid commit style, must be 'conventional', 'simple' or 'emoji'",
-                'invalid_temperature': 'Temperature must be between 0.1 and 1.0',
-                'invalid_max_diff_length': 'Max diff length must be at least 100',
-            }
-        }
-        
-        errors = error_messages[lang]
-        
-        # 检查API Key
-        if not self.config.get('api_key'):
-            return False, errors['no_api_key']
-        
-        # 检查模型名称
-        if not self.config.get('model'):
-            return False, errors['no_model']
-        
-        # 检查语言
-        if self.config.get('language') not in ['zh-CN', 'en']:
-            return False, errors['invalid_language']
-        
-        # 检查提交风格
-        if self.config.get('commit_style') not in ['conventional', 'simple', 'emoji']:
-            return False, errors['invalid_commit_style']
-        
-        # 检查temperature范围
-        temp = self.config.get('temperature', 0.7)
-        if not isinstance(temp, (int, float)) or temp < 0.1 or temp > 1.0:
-            return False, errors['invalid_temperature']
-        
-        # 检查max_diff_length
-        max_len = self.config.get('max_diff_length', 3000)
-        if not isinstance(max_len, int) or max_len < 100:
-            return False, errors['invalid_max_diff_length']
-        
+
+        # 按校验表单次遍历，遇到首个错误即返回
+        errors = _ERROR_MESSAGES[lang]
+        config = self.config
+        for key, is_valid, error_id in _VALIDATORS:
+            if not is_valid(config.get(key, self.default_config.get(key))):
+                return False, errors[error_id]
+
         return True, ""
     
     def get(self, key: str, default: Any = None) -> Any:
@@ -155,6 +244,7 @@ class ConfigManager:
     def set(self, key: str, value: Any) -> None:
         """设置配置项"""
         self.config[key] = value
+        self._version += 1
     
     def get_api_key(self) -> str:
         """获取API密钥（安全方法）"""
@@ -163,6 +253,7 @@ class ConfigManager:
     def set_api_key(self, api_key: str) -> None:
         """设置API密钥"""
         self.config['api_key'] = api_key.strip()
+        self._version += 1
     
     def get_all(self) -> Dict[str, Any]:
         """获取所有配置"""
@@ -171,10 +262,12 @@ class ConfigManager:
     def update(self, new_config: Dict[str, Any]) -> None:
         """更新配置（部分更新）"""
         self.config.update(new_config)
+        self._version += 1
     
     def reset_to_default(self) -> None:
         """重置为默认配置"""
         self.config = self.default_config.copy()
+        self._version += 1
         self.save()
     
     def get_config_path(self) -> str:
@@ -3,61 +3,66 @@ DeepSeek API调用封装模块
 构建提示词，调用DeepSeek API生成提交信息，处理响应和错误。
 """
 
-import requests
 import json
+import random
+import re
 import time
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# urllib3延迟导入：--help、配置读写等不触网的路径不再支付其导入开销
+# （导入开销包括ssl等传递依赖，冷启动可感知）
+urllib3 = None
 
-class DeepSeekAPI:
-    """DeepSeek API调用类"""
-    
-    def __init__(self, config_manager):
-        """
-        初始化DeepSeek API客户端
-        
-        Args:
-            config_manager: 配置管理器实例
-        """
-        self.config = config_manager
-        self.api_key = config_manager.get_api_key()
-        self.base_url = config_manager.get('api_base_url', 'https://api.deepseek.com/v1/chat/completions')
-        self.model = config_manager.get('model', 'deepseek-chat')
-        self.timeout = 30  # 请求超时时间（秒）
-        self.max_retries = 3  # 最大重试次数
-    
-    def build_commit_prompt(self, git_info: Dict, style: str = "conventional", language: str = "zh-CN") -> str:
-        """
-        构建提交信息生成的提示词
-        
-        Args:
-            git_info: 从GitHelper获取的信息字典
-            style: 提交风格 (conventional, simple, emoji)
-            language: 语言 (zh-CN, en)
-            
-        Returns:
-            构建好的提示词
-        """
-        diff = git_info.get('diff', '')
-        files = git_info.get('files', [])
-        branch = git_info.get('branch', 'unknown')
-        
-        # 中英文模板
-        if language == 'zh-CN':
-            if style == 'conventional':
-                style_instruction = """
+
+def _ensure_urllib3() -> None:
+    """按需导入urllib3，仅在首次构造API客户端时执行"""
+    global urllib3
+    if urllib3 is None:
+        import urllib3 as _urllib3
+        urllib3 = _urllib3
+
+# 可选的orjson快速通道：加速请求体序列化与响应解析，不可用时回退标准库json
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+
+# diff截断的余量：容纳GitHelper.get_staged_diff附加的截断标记，
+# 只有明显超限（非来自get_staged_diff）的diff才在此处二次截断
+_TRUNCATION_SLACK = 64
+
+# 清理生成消息用的预编译正则：开头/结尾的代码块标记、多余空白行。
+# 开头围栏的语言标记行可选，兼容"```feat: x```"这类单行围栏消息
+_FENCE_RE = re.compile(r'\A\s*```(?:[^\n]*\n)?|\n?```\s*\Z')
+_BLANK_LINES_RE = re.compile(r'[ \t]*\n[ \t\n]*')
+
+
+# 各(语言, 风格)组合的风格说明
+_STYLE_INSTRUCTIONS = {
+    ('zh-CN', 'conventional'): """
 请遵循Conventional Commits规范生成提交信息：
 - 格式：<type>(<scope>): <subject>
 - type类型：feat(新功能)、fix(修复)、docs(文档)、style(格式)、refactor(重构)、test(测试)、chore(构建/工具)
 - scope：可选，表示影响范围
 - subject：简短描述，不超过50字符
 - 如果需要，可以在空行后添加详细描述
-"""
-            elif style == 'emoji':
-                style_instruction = """
+""",
+    ('zh-CN', 'emoji'): """
 请使用emoji风格的提交信息：
 - ✨ 新功能
 - 🐛 修复bug
@@ -67,11 +72,33 @@ class DeepSeekAPI:
 - ✅ 测试
 - 🔧 工具/构建
 格式：<emoji> <简短描述>
-"""
-            else:  # simple
-                style_instruction = "请生成简洁明了的提交信息，不超过72字符。"
-            
-            prompt = f"""你是一个专业的Git提交信息生成助手。请根据以下Git代码变更，生成一条专业的提交信息。
+""",
+    ('zh-CN', 'simple'): "请生成简洁明了的提交信息，不超过72字符。",
+    ('en', 'conventional'): """
+Please follow Conventional Commits specification:
+- Format: <type>(<scope>): <subject>
+- Types: feat, fix, docs, style, refactor, test, chore
+- scope: optional, indicates the scope of change
+- subject: brief description, max 50 characters
+- Optionally add detailed description after blank line
+""",
+    ('en', 'emoji'): """
+Please use emoji-style commit message:
+- ✨ New feature
+- 🐛 Bug fix
+- 📝 Documentation
+- 💄 Style
+- ♻️ Refactor
+- ✅ Test
+- 🔧 Tool/Build
+Format: <emoji> <brief description>
+""",
+    ('en', 'simple'): "Please generate a concise commit message, max 72 characters.",
+}
+
+# 提示词主体模板，{style_instruction}在导入时内联
+_BASE_PROMPTS = {
+    'zh-CN': """你是一个专业的Git提交信息生成助手。请根据以下Git代码变更，生成一条专业的提交信息。
 
 **代码差异：**
 ```
@@ -79,7 +106,7 @@ class DeepSeekAPI:
 ```
 
 **变更文件：**
-{chr(10).join(f'- {f}' for f in files)}
+{files}
 
 **当前分支：** {branch}
 
@@ -92,34 +119,8 @@ class DeepSeekAPI:
 3. 使用中文描述
 4. 保持简洁专业
 
-请直接返回提交信息："""
-        
-        else:  # English
-            if style == 'conventional':
-                style_instruction = """
-Please follow Conventional Commits specification:
-- Format: <type>(<scope>): <subject>
-- Types: feat, fix, docs, style, refactor, test, chore
-- scope: optional, indicates the scope of change
-- subject: brief description, max 50 characters
-- Optionally add detailed description after blank line
-"""
-            elif style == 'emoji':
-                style_instruction = """
-Please use emoji-style commit message:
-- ✨ New feature
-- 🐛 Bug fix
-- 📝 Documentation
-- 💄 Style
-- ♻️ Refactor
-- ✅ Test
-- 🔧 Tool/Build
-Format: <emoji> <brief description>
-"""
-            else:  # simple
-                style_instruction = "Please generate a concise commit message, max 72 characters."
-            
-            prompt = f"""You are a professional Git commit message generator. Please generate a professional commit message based on the following Git code changes.
+请直接返回提交信息：""",
+    'en': """You are a professional Git commit message generator. Please generate a professional commit message based on the following Git code changes.
 
 **Code Diff:**
 ```
@@ -127,7 +128,7 @@ Format: <emoji> <brief description>
 ```
 
 **Changed Files:**
-{chr(10).join(f'- {f}' for f in files)}
+{files}
 
 **Current Branch:** {branch}
 
@@ -140,9 +141,147 @@ Format: <emoji> <brief description>
 3. Use English
 4. Keep it concise and professional
 
-Please return the commit message directly:"""
+Please return the commit message directly:""",
+}
+
+# 导入时构建完整模板，调用时只需一次format
+_PROMPT_TEMPLATES = {
+    (lang, style): _BASE_PROMPTS[lang].replace('{style_instruction}', instruction)
+    for (lang, style), instruction in _STYLE_INSTRUCTIONS.items()
+}
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """计算重试等待时间
+
+    优先遵循服务端的Retry-After头；否则指数退避并加入随机抖动，
+    避免多个客户端同步重试，等待时间上限10秒。
+
+    Args:
+        attempt: 当前重试次数（从0开始）
+        retry_after: 响应中的Retry-After头（秒），可为None
+
+    Returns:
+        等待秒数
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), 10.0)
+        except ValueError:
+            pass
+    return min((2 ** attempt) * (0.5 + random.random() * 0.5), 10.0)
+
+
+@lru_cache(maxsize=8)
+def _build_prompt_cached(diff: str, files: tuple, branch: str,
+                         style: str, language: str) -> str:
+    """按(diff, 文件列表, 分支, 风格, 语言)缓存构建好的提示词
+
+    同一份暂存内容重试生成（如调整temperature后重来）时直接复用，
+    maxsize=8限制缓存占用。参数变化时lru_cache按键自动失效。
+    """
+    files_block = '\n'.join(f'- {f}' for f in files)
+    return _PROMPT_TEMPLATES[(language, style)].format(
+        diff=diff, files=files_block, branch=branch)
+
+
+class DeepSeekAPI:
+    """DeepSeek API调用类"""
+
+    # 固定实例属性：省去实例__dict__，热路径上的属性读取变为C层偏移查找
+    __slots__ = ('config', 'api_key', 'base_url', 'model', 'timeout',
+                 'max_retries', 'http', '_headers', '_base_payload',
+                 '_seen_version')
+
+    _instances: Dict[tuple, 'DeepSeekAPI'] = {}
+
+    @classmethod
+    def get_instance(cls, config_manager) -> 'DeepSeekAPI':
+        """
+        获取缓存的API客户端实例
+
+        按(配置管理器, api_key, base_url, model)缓存，同一进程内
+        复用连接池，避免重复建立TLS连接
+
+        Args:
+            config_manager: 配置管理器实例
+
+        Returns:
+            DeepSeekAPI实例
+        """
+        key = (
+            id(config_manager),
+            config_manager.get_api_key(),
+            config_manager.get('api_base_url', 'https://api.deepseek.com/v1/chat/completions'),
+            config_manager.get('model', 'deepseek-chat'),
+        )
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls(config_manager)
+            cls._instances[key] = instance
+        return instance
+
+    def __init__(self, config_manager):
+        """
+        初始化DeepSeek API客户端
         
-        return prompt
+        Args:
+            config_manager: 配置管理器实例
+        """
+        _ensure_urllib3()
+        self.config = config_manager
+        self.api_key = config_manager.get_api_key()
+        self.base_url = config_manager.get('api_base_url', 'https://api.deepseek.com/v1/chat/completions')
+        self.model = config_manager.get('model', 'deepseek-chat')
+        self.timeout = 30  # 请求超时时间（秒）
+        self.max_retries = 3  # 最大重试次数
+        # 复用TCP/TLS连接：重试和多次调用共享同一连接池
+        # 直接使用urllib3，省去requests及其传递依赖的导入和打包体积
+        self.http = urllib3.PoolManager(num_pools=1, maxsize=4)
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        # 已观察到的配置版本：版本不变时跳过API Key重读（观察-失效模式）
+        self._seen_version = config_manager._version
+        # 请求体中不变的部分只构建一次，每次调用仅合并messages和temperature
+        self._base_payload = {
+            "model": self.model,
+            "max_tokens": 200,  # 提交信息通常不需要太长
+            "stream": False
+        }
+    
+    def build_commit_prompt(self, git_info: Dict, style: str = "conventional", language: str = "zh-CN") -> str:
+        """
+        构建提交信息生成的提示词
+        
+        Args:
+            git_info: 从GitHelper获取的信息字典
+            style: 提交风格 (conventional, simple, emoji)
+            language: 语言 (zh-CN, en)
+            
+        Returns:
+            构建好的提示词
+        """
+        diff = git_info.get('diff', '')
+        files = git_info.get('files', [])
+        branch = git_info.get('branch', 'unknown')
+
+        # 按配置截断过长diff：保留首尾、截掉中间，减少上传字节和API延迟。
+        # get_staged_diff已按同一上限截断并附加标记，长度会略超max_len，
+        # 预留标记余量避免对已截断的diff再切一刀、叠加两种截断标记
+        max_len = self.config.get('max_diff_length', 3000)
+        if max_len and len(diff) > max_len + _TRUNCATION_SLACK:
+            half = max_len // 2
+            diff = diff[:half] + f"\n...[已截断 {len(diff) - max_len} 字符]...\n" + diff[-half:]
+
+        if language not in ('zh-CN', 'en'):
+            language = 'zh-CN'
+        if style not in ('conventional', 'simple', 'emoji'):
+            style = 'conventional'
+
+        # 委托给带lru_cache的模块函数：重复生成同一暂存内容时直接命中缓存
+        return _build_prompt_cached(diff, tuple(files), branch, style, language)
     
     def generate_commit_message(self, git_info: Dict) -> Tuple[bool, str]:
         """
@@ -154,8 +293,12 @@ Please return the commit message directly:"""
         Returns:
             (成功标志, 提交信息或错误信息)
         """
-        # 检查API Key
-        self.api_key = self.config.get_api_key()
+        # 检查API Key：仅当配置版本变化时才重读并刷新请求头
+        version = self.config._version
+        if version != self._seen_version:
+            self.api_key = self.config.get_api_key()
+            self._headers['Authorization'] = f"Bearer {self.api_key}"
+            self._seen_version = version
         if not self.api_key:
             return False, "API Key未设置，请在配置中设置DeepSeek API Key"
         
@@ -171,40 +314,30 @@ Please return the commit message directly:"""
         if estimated_tokens > 8000:  # DeepSeek模型通常支持16k上下文，留出安全余量
             logger.warning(f"提示词可能过长，估算token: {estimated_tokens}")
         
-        # 准备请求数据
+        # 准备请求数据（固定部分来自_base_payload）
         payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": temperature,
-            "max_tokens": 200,  # 提交信息通常不需要太长
-            "stream": False
+            **self._base_payload,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature
         }
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
-        
+
         # 重试机制
         last_error = None
         for attempt in range(self.max_retries):
             try:
                 logger.debug(f"调用DeepSeek API (尝试 {attempt + 1}/{self.max_retries})...")
-                response = requests.post(
+                response = self.http.request(
+                    'POST',
                     self.base_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=self.timeout
+                    body=_dumps(payload),
+                    headers=self._headers,
+                    timeout=self.timeout,
+                    retries=False
                 )
-                
+
                 # 检查HTTP状态码
-                if response.status_code == 200:
-                    result = response.json()
+                if response.status == 200:
+                    result = _loads(response.data)
                     
                     # 解析响应
                     if 'choices' in result and len(result['choices']) > 0:
@@ -220,55 +353,60 @@ Please return the commit message directly:"""
                         logger.error(error_msg)
                         return False, error_msg
                 
-                elif response.status_code == 401:
+                elif response.status == 401:
                     error_msg = "API Key无效或已过期，请检查配置"
                     logger.error(error_msg)
                     return False, error_msg
                 
-                elif response.status_code == 429:
+                elif response.status == 429:
                     error_msg = "API请求频率过高，请稍后重试"
                     logger.debug(f"{error_msg} (尝试 {attempt + 1}/{self.max_retries})")
                     if attempt < self.max_retries - 1:
-                        time.sleep(2 ** attempt)  # 指数退避
+                        time.sleep(_retry_delay(attempt, response.headers.get('Retry-After')))
                         continue
                     return False, error_msg
                 
-                elif response.status_code >= 500:
-                    error_msg = f"DeepSeek API服务器错误 ({response.status_code})"
+                elif response.status >= 500:
+                    error_msg = f"DeepSeek API服务器错误 ({response.status})"
                     logger.debug(f"{error_msg} (尝试 {attempt + 1}/{self.max_retries})")
                     if attempt < self.max_retries - 1:
-                        time.sleep(2 ** attempt)
+                        time.sleep(_retry_delay(attempt, response.headers.get('Retry-After')))
                         continue
                     return False, error_msg
                 
                 else:
                     try:
-                        error_detail = response.json()
-                        error_msg = error_detail.get('error', {}).get('message', f"API错误 ({response.status_code})")
+                        error_detail = _loads(response.data)
+                        error_msg = error_detail.get('error', {}).get('message', f"API错误 ({response.status})")
                     except:
-                        error_msg = f"API错误 ({response.status_code}): {response.text[:200]}"
+                        error_msg = f"API错误 ({response.status}): {response.data.decode('utf-8', 'replace')[:200]}"
                     logger.error(error_msg)
                     return False, error_msg
             
-            except requests.exceptions.Timeout:
-                last_error = "请求超时，请检查网络连接"
+            # 连接类错误必须先于TimeoutError捕获：
+            # NewConnectionError继承ConnectTimeoutError（即TimeoutError），
+            # 顺序颠倒会把连接拒绝/DNS失败误报为超时
+            except (urllib3.exceptions.NewConnectionError,
+                    urllib3.exceptions.MaxRetryError,
+                    urllib3.exceptions.ProtocolError):
+                last_error = "网络连接错误，请检查网络设置"
                 logger.debug(f"{last_error} (尝试 {attempt + 1}/{self.max_retries})")
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    time.sleep(_retry_delay(attempt))
                     continue
-            
-            except requests.exceptions.ConnectionError:
-                last_error = "网络连接错误，请检查网络设置"
+
+            except urllib3.exceptions.TimeoutError:
+                last_error = "请求超时，请检查网络连接"
                 logger.debug(f"{last_error} (尝试 {attempt + 1}/{self.max_retries})")
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    time.sleep(_retry_delay(attempt))
                     continue
             
             except Exception as e:
                 last_error = f"调用API时出错: {str(e)}"
                 logger.debug(f"{last_error} (尝试 {attempt + 1}/{self.max_retries})")
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    time.sleep(_retry_delay(attempt))
                     continue
         
         return False, last_error or "未知错误"
@@ -283,21 +421,9 @@ Please return the commit message directly:"""
         Returns:
             清理后的消息
         """
-        # 移除代码块标记
-        message = message.strip()
-        if message.startswith('```'):
-            lines = message.split('\n')
-            # 移除第一行和最后一行（代码块标记）
-            if len(lines) > 2:
-                message = '\n'.join(lines[1:-1])
-            else:
-                message = message.replace('```', '').strip()
-        
-        # 移除多余的空白行
-        lines = [line.strip() for line in message.split('\n') if line.strip()]
-        message = '\n'.join(lines)
-        
-        return message.strip()
+        # 移除代码块标记，再合并多余的空白行（均为单次C层正则替换）
+        message = _FENCE_RE.sub('', message.strip())
+        return _BLANK_LINES_RE.sub('\n', message).strip()
     
     def test_api_key(self, api_key: Optional[str] = None) -> Tuple[bool, str]:
         """
@@ -324,31 +450,35 @@ Please return the commit message directly:"""
             ],
             "max_tokens": 10
         }
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {test_key}"
-        }
-        
+
         try:
-            response = requests.post(
+            # 测试密钥可能与默认密钥不同，单独构造Authorization头
+            response = self.http.request(
+                'POST',
                 self.base_url,
-                headers=headers,
-                json=payload,
-                timeout=10
+                body=_dumps(payload),
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {test_key}"
+                },
+                timeout=10,
+                retries=False
             )
-            
-            if response.status_code == 200:
+
+            if response.status == 200:
                 return True, "API Key有效"
-            elif response.status_code == 401:
+            elif response.status == 401:
                 return False, "API Key无效或已过期"
             else:
-                return False, f"测试失败: {response.status_code}"
-        
-        except requests.exceptions.Timeout:
-            return False, "请求超时，请检查网络连接"
-        except requests.exceptions.ConnectionError:
+                return False, f"测试失败: {response.status}"
+
+        # 连接类错误先于TimeoutError捕获（NewConnectionError是其子类）
+        except (urllib3.exceptions.NewConnectionError,
+                urllib3.exceptions.MaxRetryError,
+                urllib3.exceptions.ProtocolError):
             return False, "网络连接错误"
+        except urllib3.exceptions.TimeoutError:
+            return False, "请求超时，请检查网络连接"
         except Exception as e:
             return False, f"测试时出错: {str(e)}"
     
@@ -364,8 +494,12 @@ Please return the commit message directly:"""
             估算的token数量
         """
         # 简单估算：中文字符按1.5字符/token，英文按4字符/token
-        chinese_chars = sum(1 for c in text if '\u4e00' <= c <= '\u9fff')
-        other_chars = len(text) - chinese_chars
+        # 用一次C层UTF-8编码代替逐字符Python循环：
+        # 中文字符编码为3字节、ASCII为1字节，因此(字节数-字符数)//2近似为中文字符数
+        char_count = len(text)
+        byte_count = len(text.encode('utf-8'))
+        chinese_chars = (byte_count - char_count) // 2
+        other_chars = char_count - chinese_chars
         
         estimated = int(chinese_chars / 1.5 + other_chars / 4)
         return estimated
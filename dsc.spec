@@ -0,0 +1,65 @@
+# -*- mode: python ; coding: utf-8 -*-
+"""
+dsc打包规格文件
+相比纯命令行参数，spec可以在Analysis之后精细剔除无用的二进制文件，
+并固化optimize/strip/upx等设置，保证每次构建可复现。
+"""
+
+from pathlib import Path
+
+project_root = Path(SPECPATH)
+icon_path = project_root / 'icon.ico'
+
+# CLI用不到的第三方库和标准库大件
+# 注意：email不可排除——urllib3经http.client传递依赖email.parser/message
+excludes = [
+    'matplotlib', 'numpy', 'pandas', 'scipy', 'PIL',
+    # requests及其传递依赖已不再使用（直接调用urllib3）
+    'requests', 'charset_normalizer', 'chardet', 'idna',
+    'tkinter', 'unittest', 'test', 'pydoc', 'xml',
+    'http.server', 'distutils', 'setuptools',
+]
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[
+        'winreg',   # Windows注册表访问
+        'urllib3',  # 延迟导入，保险起见显式声明
+        'orjson',   # 可选依赖，环境中存在时打入包内
+    ],
+    hookspath=[],
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=2,  # 字节码级去除assert和docstring
+)
+
+# 剔除CLI用不到的大块二进制（tcl/tk、MFC、Windows兼容层DLL等）
+_BINARY_DENYLIST = ('tcl', 'tk8', 'libtk', 'mfc', 'api-ms-win')
+a.binaries = [
+    b for b in a.binaries
+    if not any(tag in b[0].lower() for tag in _BINARY_DENYLIST)
+]
+
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    a.binaries,
+    a.datas,
+    [],
+    name='dsc',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=True,   # 去除调试符号
+    upx=True,
+    # 运行时引导依赖的DLL不能压缩，否则可能启动失败或被杀软误报
+    upx_exclude=['vcruntime140.dll', 'python3*.dll'],
+    runtime_tmpdir=None,
+    console=True,  # 控制台CLI，输出生成的提交信息
+    icon=str(icon_path) if icon_path.exists() else None,
+)
@@ -3,6 +3,8 @@ Git操作封装模块
 提供简洁的API接口用于Git仓库操作，包括获取差异、文件列表、分支信息等。
 """
 
+import functools
+import re
 import subprocess
 import os
 import shutil
@@ -15,6 +17,179 @@ from config import get_config
 
 logger = logging.getLogger(__name__)
 
+# 预编译的Git错误行匹配：多行模式下一次search定位首个error:/fatal:行，
+# 代替对整个stderr的逐行切分和多轮遍历
+_ERROR_RE = re.compile(r'^(?:error|fatal):\s*(.+)$', re.M)
+
+
+@functools.lru_cache(maxsize=8)
+def _locate_git_repo(start: str) -> Optional[str]:
+    """
+    从start向上查找Git仓库根目录（按起始路径缓存）
+
+    探测结果只取决于文件系统布局，同一进程内重复构造GitHelper时
+    无需重新逐级stat。
+
+    Args:
+        start: 绝对路径字符串
+
+    Returns:
+        仓库根目录路径字符串，未找到返回None
+    """
+    # 纯字符串+os.path逐级上行：每层一次lexists系统调用，
+    # 不再按层分配Path对象
+    current = start
+    while True:
+        if os.path.lexists(os.path.join(current, '.git')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_git_executable() -> Optional[str]:
+    """
+    查找git可执行文件（结果进程内缓存）
+
+    PATH查找、常见安装路径stat和注册表访问都是机器状态的纯函数，
+    进程内只探测一次。
+
+    Returns:
+        git可执行文件路径，未找到返回None
+    """
+    # 常见路径
+    common_paths = [
+        r'C:\Program Files\Git\cmd\git.exe',
+        r'C:\Program Files (x86)\Git\cmd\git.exe',
+        r'C:\Program Files\Git\bin\git.exe',
+        r'C:\Program Files (x86)\Git\bin\git.exe',
+    ]
+
+    # 检查PATH环境变量
+    git_in_path = shutil.which('git.exe') or shutil.which('git')
+    if git_in_path:
+        return git_in_path
+
+    # 检查常见路径（filter在C层迭代，命中即停）
+    found = next(filter(os.path.lexists, common_paths), None)
+    if found:
+        return found
+
+    # 尝试从注册表查找（Windows）
+    try:
+        import winreg
+        key = winreg.OpenKey(
+            winreg.HKEY_LOCAL_MACHINE,
+            r'SOFTWARE\GitForWindows'
+        )
+        install_path = winreg.QueryValueEx(key, 'InstallPath')[0]
+        git_exe = os.path.join(install_path, 'cmd', 'git.exe')
+        if os.path.exists(git_exe):
+            return git_exe
+    except Exception:
+        pass
+
+    return None
+
+
+def _parse_z(output: str) -> List[str]:
+    """
+    切分git -z模式的NUL分隔输出为路径列表
+
+    相比按行切分后逐行strip，NUL分隔每个路径只做一次判断；
+    且-z下Git不对含特殊字符的路径做引号转义，结果可直接使用。
+    """
+    return [p for p in output.split('\0') if p]
+
+
+def _memoize_by_index_state(method):
+    """
+    按.git/index与HEAD状态缓存方法结果的装饰器
+
+    缓存键为(index/HEAD的mtime+size, 调用参数)；暂存、提交等操作
+    改变index后键随之变化，缓存自动失效。每个实例只保留最近一次结果，
+    避免同一次运行内重复执行相同的git子进程（如diff --cached）。
+    """
+    cache_attr = '_cache_' + method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        key = (self._index_state(), args)
+        cached = getattr(self, cache_attr, None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        value = method(self, *args)
+        setattr(self, cache_attr, (key, value))
+        return value
+    return wrapper
+
+
+class RepoInfo:
+    """
+    仓库信息的惰性视图
+
+    各字段在首次访问时才执行对应的git查询并缓存：校验失败等
+    提前返回的路径不会触发diff生成。支持字典式访问
+    （repo_info['diff'] / repo_info.get('diff')），与原先返回的
+    普通字典保持兼容。
+    """
+
+    __slots__ = ('_helper', '_max_diff_length', '_batch', '_diff')
+
+    # 对外暴露的字段名（字典式访问的合法键）
+    _KEYS = ('diff', 'files', 'branch', 'repo_name', 'repo_path')
+
+    def __init__(self, helper: 'GitHelper', max_diff_length: int):
+        self._helper = helper
+        self._max_diff_length = max_diff_length
+        self._batch = None
+        self._diff = None
+
+    def _ensure_batch(self) -> Dict[str, any]:
+        """首次访问files/branch/diff时执行一次批量status"""
+        if self._batch is None:
+            self._batch = self._helper._run_git_batch()
+        return self._batch
+
+    @property
+    def files(self) -> List[str]:
+        return self._ensure_batch()['staged_files']
+
+    @property
+    def branch(self) -> str:
+        return self._ensure_batch()['branch']
+
+    @property
+    def diff(self) -> str:
+        if self._diff is None:
+            # 无暂存内容时直接给空串，不执行git diff
+            if self._ensure_batch()['has_staged']:
+                self._diff = self._helper.get_staged_diff(self._max_diff_length)
+            else:
+                self._diff = ''
+        return self._diff
+
+    @property
+    def repo_name(self) -> str:
+        return self._helper.repo_path.name
+
+    @property
+    def repo_path(self) -> str:
+        return str(self._helper.repo_path)
+
+    def __getitem__(self, key: str):
+        if key in self._KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        """字典风格的取值（键不存在时返回default）"""
+        if key in self._KEYS:
+            return getattr(self, key)
+        return default
+
 
 class GitHelper:
     """Git操作辅助类"""
@@ -38,59 +213,36 @@ class GitHelper:
         self.git_exe = self.find_git_executable()
         if not self.git_exe:
             raise FileNotFoundError("未找到Git可执行文件，请确保已安装Git")
-        
+
+        # 每次调用共享的基础命令和环境，只构建一次：
+        # -C 指定仓库省去子进程cwd切换；GIT_OPTIONAL_LOCKS=0让status等
+        # 只读命令跳过index锁写入，降低每次git调用的固定开销
+        self._git_base = [self.git_exe, '-C', str(self.repo_path)]
+        self._git_env = {**os.environ, 'GIT_OPTIONAL_LOCKS': '0'}
+
         logger.info(f"GitHelper初始化: 仓库路径={self.repo_path}, Git={self.git_exe}")
     
     def _find_git_repo(self, start_path: Path) -> Optional[Path]:
-        """递归向上查找Git仓库根目录"""
-        current = start_path.resolve()
-        while current != current.parent:
-            if (current / '.git').exists():
-                return current
-            current = current.parent
-        return None
-    
+        """
+        递归向上查找Git仓库根目录（按起始路径缓存）
+
+        Args:
+            start_path: 起始目录，必须是绝对路径（Path.cwd()天然满足）。
+                不再额外resolve：resolve对每级路径组件做readlink系统调用，
+                在网络盘上开销明显
+        """
+        found = _locate_git_repo(str(start_path))
+        return Path(found) if found else None
+
     @staticmethod
     def find_git_executable() -> Optional[str]:
         """
-        在Windows系统中查找git.exe
-        
+        在Windows系统中查找git.exe（结果进程内缓存）
+
         Returns:
             git可执行文件路径，如果未找到则返回None
         """
-        # 常见路径
-        common_paths = [
-            r'C:\Program Files\Git\cmd\git.exe',
-            r'C:\Program Files (x86)\Git\cmd\git.exe',
-            r'C:\Program Files\Git\bin\git.exe',
-            r'C:\Program Files (x86)\Git\bin\git.exe',
-        ]
-        
-        # 检查PATH环境变量
-        git_in_path = shutil.which('git.exe') or shutil.which('git')
-        if git_in_path:
-            return git_in_path
-        
-        # 检查常见路径
-        for path in common_paths:
-            if os.path.exists(path):
-                return path
-        
-        # 尝试从注册表查找（Windows）
-        try:
-            import winreg
-            key = winreg.OpenKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                r'SOFTWARE\GitForWindows'
-            )
-            install_path = winreg.QueryValueEx(key, 'InstallPath')[0]
-            git_exe = os.path.join(install_path, 'cmd', 'git.exe')
-            if os.path.exists(git_exe):
-                return git_exe
-        except Exception:
-            pass
-        
-        return None
+        return _probe_git_executable()
     
     def _run_git_command(self, args: List[str], capture_output: bool = True) -> Tuple[bool, str]:
         """
@@ -104,10 +256,10 @@ class GitHelper:
             (成功标志, 输出或错误信息)
         """
         try:
-            cmd = [self.git_exe] + args
+            cmd = self._git_base + args
             result = subprocess.run(
                 cmd,
-                cwd=str(self.repo_path),
+                env=self._git_env,
                 capture_output=capture_output,
                 text=True,
                 encoding='utf-8',
@@ -123,26 +275,21 @@ class GitHelper:
                 logger.debug(f"Git命令失败: {' '.join(cmd)}, 错误: {error_msg}")
                 # 提取简洁的错误信息，避免输出大量帮助信息
                 if error_msg:
-                    # 查找第一个错误行（通常以 "error:" 或 "fatal:" 开头）
-                    lines = error_msg.split('\n')
-                    error_line = None
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith('error:') or line.startswith('fatal:'):
-                            error_line = line
-                            break
-                    
-                    if error_line:
-                        # 只返回错误行，去掉 "error:" 或 "fatal:" 前缀
-                        clean_error = error_line.split(':', 1)[-1].strip()
+                    # 一次多行search定位错误行（通常以 "error:" 或 "fatal:" 开头），
+                    # 无需切分整个stderr
+                    m = _ERROR_RE.search(error_msg)
+                    if m:
+                        clean_error = m.group(1).strip()
                         if len(clean_error) > 150:
                             clean_error = clean_error[:150] + "..."
                         return False, clean_error
-                    
+
                     # 如果没有找到标准错误格式，返回第一行非空行
+                    # （切片比较代替startswith方法调用，每行省两次查找）
+                    lines = error_msg.split('\n')
                     for line in lines:
                         line = line.strip()
-                        if line and not line.startswith('usage:') and not line.startswith('Diff'):
+                        if line and line[:6] != 'usage:' and line[:4] != 'Diff':
                             if len(line) > 150:
                                 line = line[:150] + "..."
                             return False, line
@@ -162,6 +309,86 @@ class GitHelper:
             logger.error(error_msg)
             return False, error_msg
     
+    def _run_git_fast(self, args: List[str]) -> Tuple[int, bytes]:
+        """
+        执行输出量小的Git命令（Popen直连，单管道）
+
+        只接一个stdout管道、stderr直接丢弃：communicate在父进程内
+        单次读取，不触发subprocess为多管道准备的排水线程（Windows下
+        每次调用省两个线程）。适用于分支名、短文件列表等小输出查询。
+
+        Args:
+            args: Git命令参数列表
+
+        Returns:
+            (进程退出码, stdout原始字节)，执行异常时退出码为-1
+        """
+        try:
+            proc = subprocess.Popen(
+                self._git_base + args,
+                env=self._git_env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            try:
+                output, _ = proc.communicate(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                logger.error("Git命令执行超时")
+                return -1, b""
+            return proc.returncode, output
+        except Exception as e:
+            logger.debug(f"执行Git命令时出错: {e}")
+            return -1, b""
+
+    def _run_git_command_status_only(self, args: List[str]) -> int:
+        """
+        执行Git命令，只返回退出码（不捕获输出）
+
+        适用于仅凭退出码即可回答的查询（如diff --cached --quiet）：
+        Git跳过输出格式化，Python侧也无需分配和切分字符串。
+
+        Args:
+            args: Git命令参数列表
+
+        Returns:
+            进程退出码，执行异常时返回-1
+        """
+        try:
+            result = subprocess.run(
+                self._git_base + args,
+                env=self._git_env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=30
+            )
+            return result.returncode
+        except Exception as e:
+            logger.debug(f"执行Git命令时出错: {e}")
+            return -1
+
+    def _index_state(self) -> tuple:
+        """获取.git/index与HEAD的状态指纹，作为缓存键"""
+        git_dir = self.repo_path / '.git'
+        state = []
+        for name in ('index', 'HEAD'):
+            try:
+                st = os.stat(git_dir / name)
+                state.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                state.append(None)
+        return tuple(state)
+
+    def _invalidate_cache(self) -> None:
+        """清除按index状态缓存的结果（index变更操作后调用）"""
+        for attr in ('_cache_get_staged_diff', '_cache_get_staged_files',
+                     '_cache_get_current_branch', '_cache_get_staged_and_untracked',
+                     '_cache__run_git_batch'):
+            if hasattr(self, attr):
+                delattr(self, attr)
+
+    @_memoize_by_index_state
     def get_staged_diff(self, max_length: int = 4000) -> str:
         """
         获取暂存区的代码差异
@@ -172,16 +399,48 @@ class GitHelper:
         Returns:
             差异文本
         """
-        success, diff = self._run_git_command(['diff', '--cached', '--no-color'])
-        if not success:
+        # 流式读取并在达到上限时终止Git：I/O和内存随max_length伸缩，
+        # 而不是随实际diff大小——超大暂存变更不再整体流经管道。
+        # bigFileThreshold/--no-textconv避免Git为大文件和二进制内容做无用功
+        cmd = self._git_base + ['-c', 'core.bigFileThreshold=1m',
+                                'diff', '--cached', '--no-color', '--no-textconv']
+        buf = bytearray()
+        truncated = False
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                env=self._git_env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            while True:
+                chunk = proc.stdout.read1(65536)
+                if not chunk:
+                    break
+                buf += chunk
+                if len(buf) >= max_length:
+                    truncated = True
+                    break
+            if truncated:
+                proc.terminate()  # 提前停止Git，剩余diff不再产出
+            proc.stdout.close()
+            proc.wait(timeout=30)
+        except Exception as e:
+            logger.error(f"执行Git命令时出错: {e}")
             return ""
-        
-        # 限制长度
-        if len(diff) > max_length:
-            diff = diff[:max_length] + f"\n\n... (差异过长，已截断，共{len(diff)}字符)"
-        
-        return diff
+
+        if truncated:
+            # 在字节层截断后再解码，errors='replace'兜底多字节字符边界
+            diff = bytes(buf[:max_length]).decode('utf-8', errors='replace')
+            return diff + "\n\n... (差异过长，已截断)"
+
+        if proc.returncode != 0:
+            logger.debug(f"git diff --cached退出码: {proc.returncode}")
+            return ""
+
+        return bytes(buf).decode('utf-8', errors='replace').strip()
     
+    @_memoize_by_index_state
     def get_staged_files(self) -> List[str]:
         """
         获取暂存文件列表
@@ -189,13 +448,18 @@ class GitHelper:
         Returns:
             文件路径列表
         """
-        success, output = self._run_git_command(['diff', '--cached', '--name-only'])
-        if not success:
+        # 本次运行已有批量status结果时直接复用，省一次子进程
+        batch = self._peek_batch()
+        if batch is not None:
+            return batch['staged_files']
+
+        returncode, output = self._run_git_fast(['diff', '--cached', '--name-only', '-z'])
+        if returncode != 0:
             return []
-        
-        files = [f.strip() for f in output.split('\n') if f.strip()]
-        return files
+
+        return _parse_z(output.decode('utf-8', errors='replace'))
     
+    @_memoize_by_index_state
     def get_current_branch(self) -> str:
         """
         获取当前分支名称
@@ -203,9 +467,9 @@ class GitHelper:
         Returns:
             分支名称
         """
-        success, branch = self._run_git_command(['rev-parse', '--abbrev-ref', 'HEAD'])
-        if success:
-            return branch
+        returncode, output = self._run_git_fast(['rev-parse', '--abbrev-ref', 'HEAD'])
+        if returncode == 0:
+            return output.decode('utf-8', errors='replace').strip()
         return "unknown"
     
     def has_staged_changes(self) -> bool:
@@ -215,27 +479,114 @@ class GitHelper:
         Returns:
             是否有暂存更改，如果命令执行失败或没有文件返回 False
         """
-        # 直接获取暂存文件列表，更可靠
+        # 本次运行已有批量status结果时直接复用，省一次子进程
+        batch = self._peek_batch()
+        if batch is not None:
+            return batch['has_staged']
+
+        # --quiet仅凭退出码回答：0=无差异，1=有差异，无需列出所有文件
+        returncode = self._run_git_command_status_only(['diff', '--cached', '--quiet'])
+        if returncode in (0, 1):
+            return returncode == 1
+        # 退出码异常（如git执行失败）时回退到列出文件
         files = self.get_staged_files()
         return len(files) > 0
     
-    def get_repo_info(self) -> Dict[str, any]:
+    def _peek_batch(self) -> Optional[Dict[str, any]]:
         """
-        获取完整的仓库信息
-        
+        返回仍然有效的批量status缓存结果（不触发git调用）
+
+        get_staged_files/has_staged_changes借此复用同一次运行中
+        已经执行过的status结果，而不是再起一个子进程。
+
+        Returns:
+            缓存命中时返回批量结果字典，否则返回None
+        """
+        cached = getattr(self, '_cache__run_git_batch', None)
+        if cached is not None and cached[0] == (self._index_state(), ()):
+            return cached[1]
+        return None
+
+    @_memoize_by_index_state
+    def _run_git_batch(self) -> Dict[str, any]:
+        """
+        通过一次git status --porcelain=v2 --branch获取分支、暂存文件和未跟踪文件
+
+        合并get_current_branch/get_staged_files/has_staged_changes的
+        三次子进程调用为一次，-z输出保证含特殊字符的路径解析正确
+
         Returns:
-            包含diff, files, branch, repo_name的字典
+            包含branch, staged_files, untracked_files, has_staged的字典
+        """
+        info = {
+            'branch': 'unknown',
+            'staged_files': [],
+            'untracked_files': [],
+            'has_staged': False
+        }
+        success, output = self._run_git_command(
+            ['status', '--porcelain=v2', '--branch', '-z'])
+        if not success:
+            return info
+
+        tokens = output.split('\0')
+        i = 0
+        while i < len(tokens):
+            entry = tokens[i]
+            i += 1
+            if not entry:
+                continue
+            if entry.startswith('# branch.head '):
+                info['branch'] = entry[len('# branch.head '):]
+            elif entry[0] == '1':
+                # 普通变更：1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+                parts = entry.split(' ', 8)
+                if parts[1][0] != '.':  # X位非'.'表示暂存区有变更
+                    info['staged_files'].append(parts[8])
+            elif entry[0] == '2':
+                # 重命名/复制：多一个<X><score>字段，下一个token是来源路径
+                parts = entry.split(' ', 9)
+                if parts[1][0] != '.':
+                    info['staged_files'].append(parts[9])
+                i += 1  # 跳过来源路径
+            elif entry[0] == 'u':
+                # 合并冲突：u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>
+                # 冲突文件在index中有内容，视为已暂存，
+                # 与diff --cached --quiet的判定保持一致
+                info['staged_files'].append(entry.split(' ', 10)[10])
+            elif entry[0] == '?':
+                info['untracked_files'].append(entry[2:])
+
+        info['has_staged'] = bool(info['staged_files'])
+        return info
+
+    @_memoize_by_index_state
+    def get_staged_and_untracked(self) -> Tuple[List[str], List[str]]:
+        """
+        一次子进程同时获取暂存文件和未跟踪文件列表
+
+        复用status --porcelain=v2批量解析：相比get_staged_files +
+        get_untracked_files两次调用省一次进程创建和一次工作区遍历，
+        结果按index状态缓存。
+
+        Returns:
+            (暂存文件列表, 未跟踪文件列表)
+        """
+        batch = self._run_git_batch()
+        return batch['staged_files'], batch['untracked_files']
+
+    def get_repo_info(self) -> RepoInfo:
+        """
+        获取完整的仓库信息（惰性求值）
+
+        Returns:
+            RepoInfo对象，包含diff, files, branch, repo_name字段，
+            各字段在首次访问时才执行git查询
         """
         config = get_config()
         max_diff_length = config.get('max_diff_length', 3000)
-        
-        return {
-            'diff': self.get_staged_diff(max_diff_length),
-            'files': self.get_staged_files(),
-            'branch': self.get_current_branch(),
-            'repo_name': self.repo_path.name,
-            'repo_path': str(self.repo_path)
-        }
+
+        return RepoInfo(self, max_diff_length)
     
     def commit(self, message: str) -> Tuple[bool, str]:
         """
@@ -247,11 +598,10 @@ class GitHelper:
         Returns:
             (成功标志, 错误信息)
         """
-        # 转义提交信息中的特殊字符
-        message = message.replace('"', '\\"')
-        
+        # 参数以列表形式直接传给子进程（无shell），提交信息无需转义
         success, output = self._run_git_command(['commit', '-m', message])
         if success:
+            self._invalidate_cache()
             return True, "提交成功"
         else:
             return False, output
@@ -271,6 +621,7 @@ class GitHelper:
         
         success, output = self._run_git_command(['add'] + file_paths)
         if success:
+            self._invalidate_cache()
             return True, "文件已暂存"
         else:
             return False, output
@@ -290,6 +641,7 @@ class GitHelper:
         
         success, output = self._run_git_command(['restore', '--staged'] + file_paths)
         if success:
+            self._invalidate_cache()
             return True, "文件已取消暂存"
         else:
             return False, output
@@ -313,12 +665,11 @@ class GitHelper:
         Returns:
             文件路径列表
         """
-        success, output = self._run_git_command(['diff', '--name-only'])
+        success, output = self._run_git_command(['diff', '--name-only', '-z'])
         if not success:
             return []
-        
-        files = [f.strip() for f in output.split('\n') if f.strip()]
-        return files
+
+        return _parse_z(output)
     
     def get_untracked_files(self) -> List[str]:
         """
@@ -327,12 +678,11 @@ class GitHelper:
         Returns:
             文件路径列表
         """
-        success, output = self._run_git_command(['ls-files', '--others', '--exclude-standard'])
+        success, output = self._run_git_command(['ls-files', '--others', '--exclude-standard', '-z'])
         if not success:
             return []
-        
-        files = [f.strip() for f in output.split('\n') if f.strip()]
-        return files
+
+        return _parse_z(output)
     
     def get_repo_path(self) -> str:
         """获取仓库路径"""
@@ -5,9 +5,6 @@
 
 import sys
 import os
-import argparse
-import io
-from pathlib import Path
 from typing import Dict
 
 VERSION = "1.0.0"
@@ -29,6 +26,23 @@ def _get_default_encoding() -> str:
 
 _CONSOLE_ENCODING = _get_default_encoding()
 
+# 模块级缓存stdout底层写入/刷新函数：safe_print热路径免去逐次
+# hasattr探测和属性链查找，stdout无buffer（如被替换）时为None
+_stdout_buffer = getattr(sys.stdout, 'buffer', None)
+_STDOUT_WRITE = _stdout_buffer.write if _stdout_buffer is not None else None
+_STDOUT_FLUSH = _stdout_buffer.flush if _stdout_buffer is not None else None
+del _stdout_buffer
+
+
+def _flush_stdout() -> None:
+    """刷新缓存的stdout缓冲区（safe_print不再逐次flush）"""
+    try:
+        if _STDOUT_FLUSH is not None:
+            _STDOUT_FLUSH()
+    except Exception:
+        pass
+
+
 def set_console_encoding(encoding: str) -> bool:
     """
     设置控制台编码
@@ -45,9 +59,10 @@ def set_console_encoding(encoding: str) -> bool:
         return False
     
     _CONSOLE_ENCODING = encoding.lower()
-    
-    # 设置控制台代码页
-    if sys.platform == 'win32':
+
+    # 设置控制台代码页（仅真实控制台需要；输出被重定向/管道接收时，
+    # safe_print已按_CONSOLE_ENCODING编码写入，无需ctypes调用）
+    if sys.platform == 'win32' and sys.stdout.isatty():
         try:
             import ctypes
             kernel32 = ctypes.windll.kernel32
@@ -55,18 +70,8 @@ def set_console_encoding(encoding: str) -> bool:
             kernel32.SetConsoleOutputCP(code_page)
         except:
             pass
-    
-    return True
 
-# 初始化时设置控制台代码页
-if sys.platform == 'win32':
-    try:
-        import ctypes
-        kernel32 = ctypes.windll.kernel32
-        code_page = 65001 if _CONSOLE_ENCODING == 'utf-8' else 936
-        kernel32.SetConsoleOutputCP(code_page)
-    except:
-        pass
+    return True
 
 # 多语言提示信息
 MESSAGES: Dict[str, Dict[str, str]] = {
@@ -127,21 +132,29 @@ MESSAGES: Dict[str, Dict[str, str]] = {
 }
 
 
+# 展平为(语言, 消息键) -> 文本的单层查找表：get_message从两次字典查找
+# 降为一次；intern键让元组哈希命中字符串缓存的指针比较
+_FLAT_MSGS: Dict[tuple, str] = {
+    (sys.intern(lang), sys.intern(k)): v
+    for lang, d in MESSAGES.items() for k, v in d.items()
+}
+
+
 def get_message(key: str, language: str = 'zh-CN', **kwargs) -> str:
     """
     获取本地化消息
-    
+
     Args:
         key: 消息键
         language: 语言代码 ('zh-CN' 或 'en')
         **kwargs: 格式化参数
-    
+
     Returns:
         格式化后的消息字符串
     """
-    lang = language if language in MESSAGES else 'zh-CN'
-    msg = MESSAGES[lang].get(key, MESSAGES['zh-CN'].get(key, key))
-    return msg.format(**kwargs) if kwargs else msg
+    msg = _FLAT_MSGS.get((language, key)) or _FLAT_MSGS.get(('zh-CN', key), key)
+    # 无格式化参数时跳过format调用（帮助文本等大多数消息无占位符）
+    return msg.format_map(kwargs) if kwargs else msg
 
 
 def safe_print(text: str, end: str = '\n') -> None:
@@ -153,39 +166,24 @@ def safe_print(text: str, end: str = '\n') -> None:
         end: 结束符，默认为换行符
     """
     try:
-        if sys.platform == 'win32':
-            # Windows: 直接写入缓冲区，使用检测到的编码
-            if hasattr(sys.stdout, 'buffer'):
-                try:
-                    encoded_text = text.encode(_CONSOLE_ENCODING, errors='replace')
-                    encoded_end = end.encode(_CONSOLE_ENCODING, errors='replace') if end else b''
-                    sys.stdout.buffer.write(encoded_text + encoded_end)
-                    sys.stdout.buffer.flush()
-                    return
-                except (AttributeError, UnicodeEncodeError):
-                    pass
+        if _STDOUT_WRITE is not None:
+            # 热路径：一次拼接、一次编码、一次write；刷新统一在main()
+            # 结束时由_flush_stdout完成（兼容 SourceTree 等管道接收方）
+            _STDOUT_WRITE((text + end).encode(_CONSOLE_ENCODING, 'replace'))
+            return
         # 备用方案：使用标准 print
         print(text, end=end, flush=True)
     except Exception:
-        # 最后备用方案：尝试直接输出字节
+        # 最后备用方案：尝试标准 print
         try:
-            if hasattr(sys.stdout, 'buffer'):
-                sys.stdout.buffer.write(text.encode(_CONSOLE_ENCODING, errors='replace'))
-                if end:
-                    sys.stdout.buffer.write(end.encode(_CONSOLE_ENCODING, errors='replace'))
-                sys.stdout.buffer.flush()
+            print(text, end=end, flush=True)
         except:
             pass
 
 
-def print_quick_help(language: str = 'zh-CN') -> None:
-    """
-    打印快速帮助信息
-    
-    Args:
-        language: 语言代码 ('zh-CN' 或 'en')
-    """
-    msg = (
+def _build_help(language: str) -> str:
+    """拼接指定语言的快速帮助文本"""
+    return (
         f"\n{get_message('help_title', language)}\n"
         f"{'=' * 50}\n"
         f"{get_message('help_commands', language)}\n"
@@ -200,12 +198,52 @@ def print_quick_help(language: str = 'zh-CN') -> None:
         f"{get_message('help_encoding', language)}\n"
         f"{get_message('help_tip', language)}"
     )
-    safe_print(msg, end='')
+
+
+# 帮助文本只依赖语言和VERSION，导入时一次性构建冻结
+_HELP: Dict[str, str] = {lang: _build_help(lang) for lang in ('zh-CN', 'en')}
+
+
+def print_quick_help(language: str = 'zh-CN') -> None:
+    """
+    打印快速帮助信息
+
+    Args:
+        language: 语言代码 ('zh-CN' 或 'en')
+    """
+    safe_print(_HELP.get(language, _HELP['zh-CN']), end='')
 
 
 def main() -> None:
+    try:
+        _run_cli()
+    finally:
+        # 所有safe_print的输出在此统一刷盘
+        _flush_stdout()
+
+
+def _run_cli() -> None:
     argv = sys.argv[1:]
 
+    # 初始化控制台代码页（延迟到此处，import阶段不再触碰ctypes）
+    set_console_encoding(_CONSOLE_ENCODING)
+
+    if not argv:
+        # 如果没有参数，先尝试加载配置获取语言设置
+        # （快速路径：不导入argparse/pathlib）
+        try:
+            from config import get_config
+            config = get_config()
+            language = config.get('language', 'zh-CN')
+        except:
+            language = 'zh-CN'
+        print_quick_help(language)
+        return
+
+    # 重量级导入推迟到确认需要解析参数之后，降低无参调用的冷启动开销
+    import argparse
+    from pathlib import Path
+
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument('--api-key', dest='api_key', help='DeepSeek API Key')
     parser.add_argument('--commit-style', choices=['conventional', 'simple', 'emoji'], help='Commit style')
@@ -219,17 +257,6 @@ def main() -> None:
     run_parser.add_argument('repository_path', nargs='?', help='Git repository path (optional)')
     run_parser.add_argument('--encoding', choices=['utf-8', 'gbk'], help='Output encoding (utf-8 or gbk)')
 
-    if not argv:
-        # 如果没有参数，先尝试加载配置获取语言设置
-        try:
-            from config import get_config
-            config = get_config()
-            language = config.get('language', 'zh-CN')
-        except:
-            language = 'zh-CN'
-        print_quick_help(language)
-        return
-
     args = parser.parse_args(argv)
 
     try:
@@ -336,7 +363,7 @@ def main() -> None:
             return
 
         # 获取仓库信息并调用 API
-        deepseek_api = DeepSeekAPI(config)
+        deepseek_api = DeepSeekAPI.get_instance(config)
         repo_info = git_helper.get_repo_info()
         success, result = deepseek_api.generate_commit_message(repo_info)
         if not success: